@@ -1,6 +1,10 @@
+from collections import deque
+
+import numpy as np
+
 from ase.atoms import Atoms
 from ase.data import covalent_radii
-from ase.neighborlist import NeighborList
+from ase.neighborlist import first_neighbors, neighbor_list
 
 
 def connected_atoms(atoms, index, dmax=None, scale=1.5):
@@ -23,27 +27,45 @@ def connected_indices(atoms, index, dmax=None, scale=1.5):
     if index < 0:
         index = len(atoms) + index
 
-    # set neighbor lists
+    ii, jj = _bond_edges(atoms, dmax, scale)
+    first = first_neighbors(len(atoms), ii)
+    return _connected_component(first, jj, index)
+
+
+def _connected_component(first, neighbors, index, excluded=None):
+    """Return indices of all atoms in the bond graph connected to index.
+
+    The neighbors of atom a are neighbors[first[a]:first[a + 1]].
+    If excluded is given, that atom is treated as if it were absent."""
+    # breadth-first search visiting each atom of the component once
+    visited = np.zeros(len(first) - 1, dtype=bool)
+    if excluded is not None:
+        visited[excluded] = True
+    visited[index] = True
+    queue = deque([index])
+    while queue:
+        a = queue.popleft()
+        for b in neighbors[first[a]:first[a + 1]]:
+            if not visited[b]:
+                visited[b] = True
+                queue.append(b)
+
+    if excluded is not None:
+        visited[excluded] = False
+    return np.flatnonzero(visited).tolist()
+
+
+def _bond_edges(atoms, dmax=None, scale=1.5):
+    """Return index arrays (i, j) of all bonded pairs, sorted by i.
+
+    The bond criterion is the one described in connected_indices."""
     if dmax is None:
         # define neighbors according to covalent radii
-        radii = scale * covalent_radii[atoms.get_atomic_numbers()]
+        cutoff = scale * covalent_radii[atoms.numbers]
     else:
         # define neighbors according to distance
-        radii = [0.5 * dmax] * len(atoms)
-    nl = NeighborList(radii, skin=0, self_interaction=False, bothways=True)
-    nl.update(atoms)
-
-    connected = [index] + list(nl.get_neighbors(index)[0])
-    isolated = False
-    while not isolated:
-        isolated = True
-        for i in connected:
-            for j in nl.get_neighbors(i)[0]:
-                if j not in connected:
-                    connected.append(j)
-                    isolated = False
-
-    return connected
+        cutoff = dmax
+    return neighbor_list('ij', atoms, cutoff)
 
 
 def separate(atoms, **kwargs):
@@ -52,15 +74,21 @@ def separate(atoms, **kwargs):
     Returns:
       List of Atoms object that connected_indices calls connected.
     """
-    indices = list(range(len(atoms)))
+    # The bond graph is the same for every fragment, so build it only once
+    ii, jj = _bond_edges(atoms, **kwargs)
+    first = first_neighbors(len(atoms), ii)
+
+    assigned = np.zeros(len(atoms), dtype=bool)
 
     separated = []
-    while indices:
-        my_indcs = connected_indices(atoms, indices[0], **kwargs)
+    for index in range(len(atoms)):
+        if assigned[index]:
+            continue
+        my_indcs = _connected_component(first, jj, index)
+        assigned[my_indcs] = True
         separated.append(Atoms(cell=atoms.cell, pbc=atoms.pbc))
         for i in my_indcs:
             separated[-1].append(atoms[i])
-            del indices[indices.index(i)]
 
     return separated
 
@@ -74,18 +102,15 @@ def split_bond(atoms, index1, index2, **kwargs):
 
     Returns two Atoms objects
     """
+    index1, index2 = np.arange(len(atoms))[[index1, index2]].tolist()
     assert index1 != index2
-    if index2 > index1:
-        shift = 0, 1
-    else:
-        shift = 1, 0
 
-    atoms_copy = atoms.copy()
-    del atoms_copy[index2]
-    atoms1 = connected_atoms(atoms_copy, index1 - shift[0], **kwargs)
+    # Rather than deleting the other atom from a copy of atoms, we search
+    # the bond graph of the full system while stepping around that atom:
+    ii, jj = _bond_edges(atoms, **kwargs)
+    first = first_neighbors(len(atoms), ii)
 
-    atoms_copy = atoms.copy()
-    del atoms_copy[index1]
-    atoms2 = connected_atoms(atoms_copy, index2 - shift[1], **kwargs)
+    atoms1 = atoms[_connected_component(first, jj, index1, excluded=index2)]
+    atoms2 = atoms[_connected_component(first, jj, index2, excluded=index1)]
 
     return atoms1, atoms2
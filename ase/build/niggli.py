@@ -1,15 +1,33 @@
 import numpy as np
 
 
+I3 = np.eye(3, dtype=int)
+I6 = np.eye(6, dtype=int)
+
+# Swaps of the first and second, and of the second and third cell vectors,
+# as operations on the cell (C) and on the vector of products g (D):
+SWAP01_C = -I3[[1, 0, 2]]
+SWAP01_D = I6[[1, 0, 2, 4, 3, 5]]
+SWAP12_C = -I3[[0, 2, 1]]
+SWAP12_D = I6[[0, 2, 1, 3, 5, 4]]
+
+# The final reduction step does not depend on any sign, so its operations
+# are also constant:
+REDUCE_ALL_C = I3.copy()
+REDUCE_ALL_C[:, 2] = 1
+REDUCE_ALL_D = I6.copy()
+REDUCE_ALL_D[2, :] = 1
+REDUCE_ALL_D[3, 1] = 2
+REDUCE_ALL_D[3, 5] = 1
+REDUCE_ALL_D[4, 0] = 2
+REDUCE_ALL_D[4, 5] = 1
+
+
 def cellvector_products(cell):
     cell = _pad_nonpbc(cell)
-    g0 = np.empty(6, dtype=float)
-    g0[0] = cell[0] @ cell[0]
-    g0[1] = cell[1] @ cell[1]
-    g0[2] = cell[2] @ cell[2]
-    g0[3] = 2 * (cell[1] @ cell[2])
-    g0[4] = 2 * (cell[2] @ cell[0])
-    g0[5] = 2 * (cell[0] @ cell[1])
+    # [a1 · a1, a2 · a2, a3 · a3, a2 · a3, a3 · a1, a1 · a2]
+    g0 = (cell @ cell.T).flat[[0, 4, 8, 5, 2, 1]]
+    g0[3:] *= 2
     return g0
 
 
@@ -76,9 +94,6 @@ def lmn_to_ijk(lmn):
 
 
 def _niggli_reduce(g0, eps):
-    I3 = np.eye(3, dtype=int)
-    I6 = np.eye(6, dtype=int)
-
     C = I3.copy()
     D = I6.copy()
 
@@ -96,14 +111,14 @@ def _niggli_reduce(g0, eps):
     for _ in range(10000):
         if (gt(g[0], g[1])
                 or (eq(g[0], g[1]) and gt(abs(g[3]), abs(g[4])))):
-            C = C @ (-I3[[1, 0, 2]])
-            D = I6[[1, 0, 2, 4, 3, 5]] @ D
+            C = C @ SWAP01_C
+            D = SWAP01_D @ D
             g = D @ g0
             continue
         elif (gt(g[1], g[2])
                 or (eq(g[1], g[2]) and gt(abs(g[4]), abs(g[5])))):
-            C = C @ (-I3[[0, 2, 1]])
-            D = I6[[0, 2, 1, 3, 5, 4]] @ D
+            C = C @ SWAP12_C
+            D = SWAP12_D @ D
             g = D @ g0
             continue
 
@@ -170,17 +185,8 @@ def _niggli_reduce(g0, eps):
         elif (lt(g[[0, 1, 3, 4, 5]].sum(), 0)
                 or (eq(g[[0, 1, 3, 4, 5]].sum(), 0)
                     and gt(2 * (g[0] + g[4]) + g[5], 0))):
-            A = I3.copy()
-            A[:, 2] = 1
-            C = C @ A
-
-            B = I6.copy()
-            B[2, :] = 1
-            B[3, 1] = 2
-            B[3, 5] = 1
-            B[4, 0] = 2
-            B[4, 5] = 1
-            D = B @ D
+            C = C @ REDUCE_ALL_C
+            D = REDUCE_ALL_D @ D
             g = D @ g0
         else:
             break
@@ -1,7 +1,10 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 import itertools
 import numpy as np
 from ase.lattice import bravais_lattices, UnconventionalLattice, bravais_names
-from ase.cell import Cell
+from ase.build.niggli import niggli_reduce_cell
+from ase.geometry.cell import cell_to_cellpar
 
 """This module implements a crude method to recognize most Bravais lattices.
 
@@ -131,20 +134,41 @@ niggli_op_table = {  # Generated by generate_niggli_op_table()
 # 100+ operations, we don't want to tabulate that.
 
 
+def _niggli_op_arrays(op_table):
+    arrays = {}
+    for latname, op_keys in op_table.items():
+        ops = np.array(op_keys, dtype=int).reshape(-1, 3, 3)
+        arrays[latname] = (ops, np.linalg.inv(ops.transpose(0, 2, 1)))
+    return arrays
+
+
+# For each lattice, the operations of niggli_op_table as an (nops, 3, 3)
+# array together with the inverses of their transposes.  These are needed
+# for every cell passed to identify_lattice(), so we calculate them once:
+niggli_op_arrays = _niggli_op_arrays(niggli_op_table)
+
+
+# The lattices whose Niggli operations are found by looping over grids of
+# lattice parameters.  For MCL, MCLC, and TRI that does not work (see above).
+gridded_lattice_names = tuple(name for name in bravais_names
+                              if name not in ['MCL', 'MCLC', 'TRI'])
+
+
 def lattice_loop(latcls, length_grid, angle_grid):
     """Yield all lattices defined by the length and angle grids."""
+    # Actually we could choose one parameter, a, to always be 1,
+    # reducing the dimension of the problem by 1.  The lattice
+    # recognition code should do something like that as well, but
+    # it doesn't.  This could affect the impact of the eps value
+    # on lattice determination, so we just loop over the whole
+    # thing in order not to worry.
+    if latcls.name in ['MCL', 'MCLC']:
+        special_var = 'c'
+    else:
+        special_var = 'a'
+
     param_grids = []
     for varname in latcls.parameters:
-        # Actually we could choose one parameter, a, to always be 1,
-        # reducing the dimension of the problem by 1.  The lattice
-        # recognition code should do something like that as well, but
-        # it doesn't.  This could affect the impact of the eps value
-        # on lattice determination, so we just loop over the whole
-        # thing in order not to worry.
-        if latcls.name in ['MCL', 'MCLC']:
-            special_var = 'c'
-        else:
-            special_var = 'a'
         if varname == special_var:
             values = np.ones(1)
         elif varname in 'abc':
@@ -155,10 +179,11 @@ def lattice_loop(latcls, length_grid, angle_grid):
             raise ValueError(varname)
         param_grids.append(values)
 
+    # The lattice classes take their parameters positionally in the
+    # order of latcls.parameters, so we need not build a dict per lattice:
     for latpars in itertools.product(*param_grids):
-        kwargs = dict(zip(latcls.parameters, latpars))
         try:
-            lat = latcls(**kwargs)
+            lat = latcls(*latpars)
         except (UnconventionalLattice, AssertionError):
             # XXX assertion error can happen because cellpar_to_cell
             # makes certain assumptions.  Should be investigated.
@@ -170,43 +195,56 @@ def lattice_loop(latcls, length_grid, angle_grid):
 
 
 def find_niggli_ops(latcls, length_grid, angle_grid):
-    niggli_ops = {}
+    # Count the operations by their raw bytes, which are cheaper to
+    # build and hash than tuples.  We convert to tuples at the end.
+    counts = Counter()
 
     for lat in lattice_loop(latcls, length_grid, angle_grid):
         cell = lat.tocell()
 
         try:
-            rcell, op = cell.niggli_reduce()
+            rcell, op = niggli_reduce_cell(cell)
         except RuntimeError:
             print('Niggli reduce did not converge')
             continue
         assert op.dtype == int
-        op_key = tuple(op.ravel())
-
-        if op_key in niggli_ops:
-            niggli_ops[op_key] += 1
-        else:
-            niggli_ops[op_key] = 1
+        counts[op.tobytes()] += 1
 
-        rcell_test = Cell(op.T @ cell)
-        rcellpar_test = rcell_test.cellpar()
-        rcellpar = rcell.cellpar()
-        err = np.abs(rcellpar_test - rcellpar).max()
-        assert err < 1e-7, err
+        if __debug__:
+            # Check that op maps the cell to the reduced cell.  Like the
+            # assertion itself, this is skipped when running python -O:
+            rcellpar_test = cell_to_cellpar(op.T @ cell.array)
+            rcellpar = rcell.cellpar()
+            err = np.abs(rcellpar_test - rcellpar).max()
+            assert err < 1e-7, err
 
-    return niggli_ops
+    return {tuple(np.frombuffer(op_bytes, dtype=int).tolist()): count
+            for op_bytes, count in counts.items()}
 
 
-def find_all_niggli_ops(length_grid, angle_grid, lattices=None):
+def find_all_niggli_ops(length_grid, angle_grid, lattices=None,
+                        processes=1):
     all_niggli_ops = {}
     if lattices is None:
-        lattices = [name for name in bravais_names
-                    if name not in ['MCL', 'MCLC', 'TRI']]
+        lattices = gridded_lattice_names
+
+    latclasses = [bravais_lattices[latname] for latname in lattices]
+    if processes == 1:
+        def serial_results():
+            for latname, latcls in zip(lattices, latclasses):
+                print('Working on {}...'.format(latname))
+                yield find_niggli_ops(latcls, length_grid, angle_grid)
+
+        results = serial_results()
+    else:
+        # The lattices are independent, so we can do them in parallel.
+        # processes=None means one worker per CPU:
+        args = (latclasses, itertools.repeat(length_grid),
+                itertools.repeat(angle_grid))
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(executor.map(find_niggli_ops, *args))
 
-    for latname in lattices:
-        latcls = bravais_lattices[latname]
-        print('Working on {}...'.format(latname))
-        niggli_ops = find_niggli_ops(latcls, length_grid, angle_grid)
+    for latname, niggli_ops in zip(lattices, results):
         print('Found {} ops for {}'.format(len(niggli_ops), latname))
         for key, count in niggli_ops.items():
             print('  {:>40}: {}'.format(str(np.array(key)), count))
@@ -217,14 +255,16 @@ def find_all_niggli_ops(length_grid, angle_grid, lattices=None):
 
 def generate_niggli_op_table(lattices=None,
                              length_grid=None,
-                             angle_grid=None):
+                             angle_grid=None,
+                             processes=1):
 
     if length_grid is None:
         length_grid = np.logspace(-0.5, 1.5, 50).round(3)
     if angle_grid is None:
         angle_grid = np.linspace(10, 179, 50).round()
     all_niggli_ops_and_counts = find_all_niggli_ops(length_grid, angle_grid,
-                                                    lattices=lattices)
+                                                    lattices=lattices,
+                                                    processes=processes)
 
     niggli_op_table = {}
     for latname, ops in all_niggli_ops_and_counts.items():
@@ -7,6 +7,26 @@ from ase.cell import Cell
 TOL = 1E-12
 MAX_IT = 100000    # in practice this is not exceeded
 
+# All combinations of coefficients -1, 0, 1 for two basis vectors
+RELEVANT_COEFS_2D = np.array(list(itertools.product([-1, 0, 1], repeat=2)))
+
+# Combinations of basis vectors tested by is_minkowski_reduced
+MINKOWSKI_COEFS_2D = np.array([[0, 1, 0],
+                               [1, -1, 0],
+                               [1, 1, 0]])
+MINKOWSKI_COEFS_3D = np.array([[0, 1, 0],
+                               [0, 0, 1],
+                               [1, 1, 0],
+                               [1, 0, 1],
+                               [0, 1, 1],
+                               [1, -1, 0],
+                               [1, 0, -1],
+                               [0, 1, -1],
+                               [1, 1, 1],
+                               [1, -1, 1],
+                               [1, 1, -1],
+                               [1, -1, -1]])
+
 
 class CycleChecker:
 
@@ -52,7 +72,7 @@ def reduction_gauss(B, hu, hv):
 
 
 def relevant_vectors_2D(u, v):
-    cs = np.array([e for e in itertools.product([-1, 0, 1], repeat=2)])
+    cs = RELEVANT_COEFS_2D
     vs = cs @ [u, v]
     indices = np.argsort(np.linalg.norm(vs, axis=1))[:7]
     return vs[indices], cs[indices]
@@ -170,26 +190,11 @@ def is_minkowski_reduced(cell, pbc=True):
         norms = np.linalg.norm(cell, axis=1)
         cell = cell[np.argsort(norms)[[1, 2, 0]]]
 
-        A = [[0, 1, 0],
-             [1, -1, 0],
-             [1, 1, 0]]
-        lhs = np.linalg.norm(A @ cell, axis=1)
+        lhs = np.linalg.norm(MINKOWSKI_COEFS_2D @ cell, axis=1)
         norms = np.linalg.norm(cell, axis=1)
         rhs = norms[[0, 1, 1]]
     else:
-        A = [[0, 1, 0],
-             [0, 0, 1],
-             [1, 1, 0],
-             [1, 0, 1],
-             [0, 1, 1],
-             [1, -1, 0],
-             [1, 0, -1],
-             [0, 1, -1],
-             [1, 1, 1],
-             [1, -1, 1],
-             [1, 1, -1],
-             [1, -1, -1]]
-        lhs = np.linalg.norm(A @ cell, axis=1)
+        lhs = np.linalg.norm(MINKOWSKI_COEFS_3D @ cell, axis=1)
         norms = np.linalg.norm(cell, axis=1)
         rhs = norms[[0, 1, 1, 2, 2, 1, 2, 2, 2, 2, 2, 2]]
     return (lhs >= rhs - TOL).all()
@@ -1145,13 +1145,15 @@ def identify_lattice(cell, eps=2e-4, *, pbc=True):
     Returns Bravais lattice object representing the cell along with
     an operation that, applied to the cell, yields the same lengths
     and angles as the Bravais lattice object."""
-    from ase.geometry.bravais_type_engine import niggli_op_table
+    from ase.geometry.bravais_type_engine import (niggli_op_table,
+                                                  niggli_op_arrays)
 
     pbc = cell.any(1) & pbc2pbc(pbc)
     npbc = sum(pbc)
 
     cell = cell.uncomplete(pbc)
     rcell, reduction_op = cell.niggli_reduce(eps=eps)
+    inv_reduction_op = np.linalg.inv(reduction_op)
 
     # We tabulate the cell's Niggli-mapped versions so we don't need to
     # redo any work when the same Niggli-operation appears multiple times
@@ -1167,21 +1169,25 @@ def identify_lattice(cell, eps=2e-4, *, pbc=True):
         # just return the first one we find so we must remember then:
         matching_lattices = []
 
-        for op_key in niggli_op_table[latname]:
-            checker_and_op = memory.get(op_key)
-            if checker_and_op is None:
-                normalization_op = np.array(op_key).reshape(3, 3)
-                candidate = Cell(np.linalg.inv(normalization_op.T) @ rcell)
-                checker = LatticeChecker(candidate, eps=eps)
-                memory[op_key] = (checker, normalization_op)
-            else:
-                checker, normalization_op = checker_and_op
+        # Apply all of this lattice's operations in one batched product:
+        normalization_ops, inv_transposed_ops = niggli_op_arrays[latname]
+        candidates = inv_transposed_ops @ rcell.array
+
+        for op_key, normalization_op, candidate in zip(
+                niggli_op_table[latname], normalization_ops, candidates):
+            checker = memory.get(op_key)
+            if checker is None:
+                checker = LatticeChecker(Cell(candidate), eps=eps)
+                memory[op_key] = checker
 
             lat = checker.query(latname)
             if lat is not None:
-                op = normalization_op @ np.linalg.inv(reduction_op)
+                op = normalization_op @ inv_reduction_op
                 matching_lattices.append((lat, op))
 
+        if len(matching_lattices) == 1:
+            return matching_lattices[0]
+
         # Among any matching lattices, return the one with lowest
         # orthogonality defect:
         best = None
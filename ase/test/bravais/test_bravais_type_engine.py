@@ -21,3 +21,14 @@ def test_generate_niggli_table(lattice_name):
     reftable = niggli_op_table[lattice_name]
 
     assert set(thistable) == set(reftable)
+
+
+def test_generate_niggli_table_parallel():
+    lattices = ['BCT', 'HEX', 'RHL']
+    table = generate_niggli_op_table(lattices=lattices,
+                                     length_grid=np.logspace(-1, 1, 30),
+                                     angle_grid=np.linspace(30, 170, 50),
+                                     processes=2)
+    assert list(table) == lattices
+    for name in lattices:
+        assert set(table[name]) == set(niggli_op_table[name])
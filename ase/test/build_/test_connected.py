@@ -31,6 +31,17 @@ def test_split_biphenyl():
     assert len(mol) < len(mol1) + len(mol2)
 
 
+def test_split_negative_index():
+    mol = molecule('CH3CH2OH')
+    natoms = len(mol)
+
+    mol1, mol2 = split_bond(mol, 1, -9)
+    ref1, ref2 = split_bond(mol, 1, natoms - 9)
+    assert mol1 == ref1
+    assert mol2 == ref2
+    assert len(mol) == len(mol1) + len(mol2)
+
+
 def test_connected_atoms():
     CO = molecule('CO')
     R = CO.get_distance(0, 1)
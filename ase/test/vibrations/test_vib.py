@@ -361,6 +361,76 @@ def test_energies_and_modes(n2_data, n2_vibdata):
                                   -n2_data['ref_forces'])
 
 
+def test_lowest_energies_and_modes():
+    rng = np.random.RandomState(0)
+    atoms = Atoms('H20', positions=rng.rand(20, 3) * 5)
+    perturbation = 0.01 * rng.rand(60, 60)
+    hessian_2d = np.diag(np.linspace(1, 10, 60)) + perturbation
+    hessian_2d += hessian_2d.T
+    vib_data = VibrationsData.from_2d(atoms, hessian_2d)
+
+    energies, modes = vib_data.get_energies_and_modes()
+    low_energies, low_modes = vib_data.get_energies_and_modes(n_modes=4)
+    assert low_modes.shape == (4, 20, 3)
+    assert_array_almost_equal(low_energies, energies[:4])
+
+    # Eigenvectors are only defined up to a sign
+    for low_mode, mode in zip(low_modes, modes):
+        overlap = np.vdot(low_mode, mode) / np.vdot(mode, mode)
+        assert abs(overlap) == pytest.approx(1, abs=1e-6)
+
+
+@pytest.fixture
+def cluster_vibdata():
+    """Cu55 icosahedron with nearest-neighbour springs
+
+    The Hessian has six clustered rigid-body modes near zero."""
+    from ase.cluster import Icosahedron
+    from ase.neighborlist import neighbor_list
+
+    atoms = Icosahedron('Cu', 3)
+    i, j, distances = neighbor_list('ijD', atoms, 2.8)
+    bonds = distances / np.linalg.norm(distances, axis=1)[:, np.newaxis]
+    blocks = -bonds[:, :, np.newaxis] * bonds[:, np.newaxis, :]
+
+    hessian = np.zeros((len(atoms), len(atoms), 3, 3))
+    np.add.at(hessian, (i, j), blocks)
+    np.add.at(hessian, (i, i), -blocks)
+    return VibrationsData(atoms, hessian.transpose(0, 2, 1, 3))
+
+
+@pytest.mark.filterwarnings('error')
+@pytest.mark.parametrize('n_modes', [4, 20])
+def test_lowest_energies_and_modes_cluster(cluster_vibdata, n_modes):
+    energies = cluster_vibdata.get_energies()
+    low_energies, _ = cluster_vibdata.get_energies_and_modes(n_modes=n_modes)
+    assert_array_almost_equal(low_energies, energies[:n_modes])
+    assert np.all(np.abs(low_energies[:6]) < 1e-4)
+
+
+def test_lowest_energies_and_modes_asymmetric(cluster_vibdata):
+    # Only the symmetric part of the Hessian should matter, for the lowest
+    # modes as for the full spectrum
+    hessian_2d = cluster_vibdata.get_hessian_2d()
+    noise = np.random.RandomState(42).rand(*hessian_2d.shape) * 1e-2
+    vib_data = VibrationsData.from_2d(cluster_vibdata.get_atoms(),
+                                      hessian_2d + noise - noise.T)
+    low_energies, _ = vib_data.get_energies_and_modes(n_modes=10)
+    # (The six rigid-body modes are too sensitive to the solver to compare)
+    assert_array_almost_equal(low_energies[6:],
+                              cluster_vibdata.get_energies()[6:10])
+
+
+def test_lowest_energies_and_modes_dense(n2_data, n2_vibdata):
+    # Requesting all modes gives the full spectrum
+    energies, modes = n2_vibdata.get_energies_and_modes(n_modes=6)
+    assert modes.shape == (6, 2, 3)
+    # (The three near-zero modes are too sensitive to the solver to compare)
+    assert_array_almost_equal(n2_data['ref_frequencies'][3:],
+                              energies[3:] / units.invcm,
+                              decimal=5)
+
+
 def test_imaginary_energies(n2_unstable_data):
     vib_data = VibrationsData(n2_unstable_data['atoms'],
                               n2_unstable_data['hessian'])
@@ -424,6 +494,61 @@ def test_pdos(n2_vibdata):
     assert sum(pdos[0].get_weights()) == pytest.approx(3.0)
 
 
+def test_hessian_views(n2_data, n2_vibdata):
+    for getter in n2_vibdata.get_hessian, n2_vibdata.get_hessian_2d:
+        view = getter(copy=False)
+        assert not view.flags.writeable
+        with pytest.raises(ValueError):
+            view[0, 0] = 1.
+
+        copy = getter()
+        assert copy.flags.writeable
+        assert not np.shares_memory(copy, view)
+        assert_array_almost_equal(copy, view)
+
+    assert_array_almost_equal(n2_vibdata.get_hessian(copy=False),
+                              n2_data['hessian'])
+
+
+def test_energies_without_modes(n2_data):
+    vib_data = VibrationsData(n2_data['atoms'], n2_data['hessian'])
+    energies = vib_data.get_energies()
+    ref_energies, _ = VibrationsData(
+        n2_data['atoms'], n2_data['hessian']).get_energies_and_modes()
+    assert_array_almost_equal(energies, ref_energies)
+    assert_array_almost_equal(vib_data.get_energies_and_modes()[0],
+                              ref_energies)
+
+
+def test_single_precision(n2_data, n2_vibdata):
+    vib_data = VibrationsData(n2_data['atoms'], n2_data['hessian'],
+                              dtype=np.float32)
+    assert vib_data.get_hessian(copy=False).dtype == np.float32
+    assert vib_data.get_energies().dtype == complex
+    assert vib_data.get_energies()[-1] == pytest.approx(
+        n2_vibdata.get_energies()[-1], rel=1e-5)
+
+
+def test_integer_hessian():
+    atoms = Atoms('H2', positions=[[0, 0, 0], [0, 0, 0.74]])
+    vib_data = VibrationsData.from_2d(atoms,
+                                      (np.eye(6, dtype=int) * 3).tolist())
+    ref_data = VibrationsData.from_2d(atoms, np.eye(6) * 3.)
+    assert_array_almost_equal(vib_data.get_energies(),
+                              ref_data.get_energies())
+    assert_array_almost_equal(vib_data.get_energies_and_modes(n_modes=2)[0],
+                              ref_data.get_energies()[:2])
+
+
+def test_asymmetric_hessian(n2_data, n2_vibdata):
+    hessian_2d = n2_vibdata.get_hessian_2d()
+    noise = np.random.RandomState(42).rand(*hessian_2d.shape) * 1e-2
+    vib_data = VibrationsData.from_2d(n2_data['atoms'],
+                                      hessian_2d + noise - noise.T)
+    assert_array_almost_equal(vib_data.get_energies(),
+                              n2_vibdata.get_energies())
+
+
 def test_todict(n2_data, n2_vibdata):
     vib_data_dict = n2_vibdata.todict()
 
@@ -434,6 +559,12 @@ def test_todict(n2_data, n2_vibdata):
                               n2_data['hessian'])
 
 
+def test_todict_copy(n2_data, n2_vibdata):
+    vib_data_dict = n2_vibdata.todict()
+    vib_data_dict['hessian'] *= 2
+    assert_array_almost_equal(n2_vibdata.get_hessian(), n2_data['hessian'])
+
+
 def test_dict_roundtrip(n2_vibdata):
     vib_data_dict = n2_vibdata.todict()
     vib_data_roundtrip = VibrationsData.fromdict(vib_data_dict)
@@ -466,6 +597,22 @@ def test_dict_indices(n2_vibdata, indices, expected_mask):
     assert_array_almost_equal(vib_data_fromdict.get_mask(), expected_mask)
 
 
+@pytest.mark.parametrize('indices, expected_indices',
+                         [([0, 2], [0, 2]),
+                          ([2, 1, 0], [2, 1, 0]),
+                          ([0, 1, 2], None)])
+def test_todict_indices(indices, expected_indices):
+    atoms = Atoms('H3', positions=np.arange(9.).reshape(3, 3))
+    n_active = len(indices)
+    vib_data = VibrationsData.from_2d(atoms, np.eye(3 * n_active),
+                                      indices=indices)
+    dict_indices = vib_data.todict()['indices']
+    if expected_indices is None:
+        assert dict_indices is None
+    else:
+        assert list(dict_indices) == expected_indices
+
+
 def test_jmol_roundtrip(testdir, n2_data):
     ir_intensities = np.random.RandomState(42).rand(6)
 
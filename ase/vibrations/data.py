@@ -1,9 +1,10 @@
 """Storage and analysis for vibrational data"""
 
 import collections
-from math import sin, pi, sqrt
+from math import pi, sqrt
 from numbers import Real, Integral
-from typing import Any, Dict, Iterator, List, Sequence, Tuple, TypeVar, Union
+from typing import (Any, Dict, Iterator, List, Optional, Sequence, Tuple,
+                    TypeVar, Union)
 
 import numpy as np
 
@@ -20,6 +21,9 @@ from ase.constraints import constrained_indices, FixCartesian, FixAtoms
 RealSequence4D = Sequence[Sequence[Sequence[Sequence[Real]]]]
 VD = TypeVar('VD', bound='VibrationsData')
 
+# Converts sqrt(eigenvalue) of the mass-weighted Hessian (eV/Å^2/amu) to eV
+_OMEGA_TO_EV = units._hbar * units.m / sqrt(units._e * units._amu)
+
 
 @jsonable('vibrationsdata')
 class VibrationsData:
@@ -52,25 +56,37 @@ class VibrationsData:
             constraints should be determined automatically from the
             atoms object.
 
+        dtype: data type for storing the Hessian, e.g. np.float32 to halve
+            memory use and speed up diagonalisation of large Hessians at
+            the cost of precision. By default the type of the input is kept.
+
     """
 
     def __init__(self,
                  atoms: Atoms,
                  hessian: Union[RealSequence4D, np.ndarray],
                  indices: Union[Sequence[int], np.ndarray] = None,
+                 dtype: Any = None,
                  ) -> None:
 
         if indices is None:
-            self._indices = self.indices_from_constraints(atoms)
-        else:
-            self._indices = np.array(indices, dtype=int)
+            indices = self.indices_from_constraints(atoms)
+        self._indices: np.ndarray = np.array(indices, dtype=int)
 
         n_atoms = self._check_dimensions(atoms, np.asarray(hessian),
                                          indices=self._indices)
         self._atoms = atoms.copy()
+        self._mask = self._mask_from_indices(self._atoms, self._indices)
 
-        self._hessian2d = (np.asarray(hessian)
-                           .reshape(3 * n_atoms, 3 * n_atoms).copy())
+        self._hessian2d = np.array(hessian, dtype=dtype, order='C').reshape(
+            3 * n_atoms, 3 * n_atoms)
+
+        # Energies from the full spectrum, with or without modes
+        self._energies: Optional[np.ndarray] = None
+
+        # Partial spectra obtained by get_energies_and_modes(n_modes=...)
+        self._partial_energies_and_modes: Dict[
+            int, Tuple[np.ndarray, np.ndarray]] = {}
 
     _setter_error = ("VibrationsData properties cannot be modified: construct "
                      "a new VibrationsData with consistent atoms, Hessian and "
@@ -79,7 +95,8 @@ class VibrationsData:
     @classmethod
     def from_2d(cls, atoms: Atoms,
                 hessian_2d: Union[Sequence[Sequence[Real]], np.ndarray],
-                indices: Sequence[int] = None) -> 'VibrationsData':
+                indices: Union[Sequence[int], np.ndarray] = None,
+                dtype: Any = None) -> 'VibrationsData':
         """Instantiate VibrationsData when the Hessian is in a 3Nx3N format
 
         Args:
@@ -90,9 +107,11 @@ class VibrationsData:
 
             indices: Indices of (non-frozen) atoms included in Hessian
 
+            dtype: Data type for storing the Hessian
+
         """
         if indices is None:
-            indices = range(len(atoms))
+            indices = np.arange(len(atoms))
         assert indices is not None  # Show Mypy that indices is now a sequence
 
         hessian_2d_array = np.asarray(hessian_2d)
@@ -100,7 +119,7 @@ class VibrationsData:
                                         indices=indices, two_d=True)
 
         return cls(atoms, hessian_2d_array.reshape(n_atoms, 3, n_atoms, 3),
-                   indices=indices)
+                   indices=indices, dtype=dtype)
 
     @staticmethod
     def indices_from_constraints(atoms: Atoms) -> List[int]:
@@ -121,11 +140,8 @@ class VibrationsData:
         const_indices = constrained_indices(
             atoms, only_include=(FixCartesian, FixAtoms))
         # Invert the selection to get free atoms
-        indices = np.setdiff1d(
-            np.array(
-                range(
-                    len(atoms))),
-            const_indices).astype(int)
+        indices = np.setdiff1d(np.arange(len(atoms)),
+                               const_indices).astype(int)
         return indices.tolist()
 
     @staticmethod
@@ -157,7 +173,7 @@ class VibrationsData:
     @staticmethod
     def _check_dimensions(atoms: Atoms,
                           hessian: np.ndarray,
-                          indices: Sequence[int],
+                          indices: Union[Sequence[int], np.ndarray],
                           two_d: bool = False) -> int:
         """Sanity check on array shapes from input data
 
@@ -174,7 +190,9 @@ class VibrationsData:
 
         """
 
-        n_atoms = len(atoms[indices])
+        # Index a plain range rather than building an Atoms subset; this
+        # still rejects out-of-range indices
+        n_atoms = len(np.arange(len(atoms))[indices])
 
         if two_d:
             ref_shape = [n_atoms * 3, n_atoms * 3]
@@ -199,7 +217,7 @@ class VibrationsData:
 
     def get_mask(self) -> np.ndarray:
         """Boolean mask of atoms selected by indices"""
-        return self._mask_from_indices(self._atoms, self.get_indices())
+        return self._mask.copy()
 
     @staticmethod
     def _mask_from_indices(atoms: Atoms,
@@ -215,12 +233,16 @@ class VibrationsData:
         mask[indices] = True
         return mask
 
-    def get_hessian(self) -> np.ndarray:
+    def get_hessian(self, copy: bool = True) -> np.ndarray:
         """The Hessian; second derivative of energy wrt positions
 
         This format is preferred for iteration over atoms and when
         addressing specific elements of the Hessian.
 
+        Args:
+            copy: If False, return a read-only view of the stored Hessian
+                rather than a copy. This avoids copying a large array.
+
         Returns:
             array with shape (n_atoms, 3, n_atoms, 3) where
 
@@ -234,14 +256,19 @@ class VibrationsData:
             z-direction of atoms[0]
         """
         n_atoms = int(self._hessian2d.shape[0] / 3)
-        return self._hessian2d.reshape(n_atoms, 3, n_atoms, 3).copy()
+        return self._hessian_array(
+            self._hessian2d.reshape(n_atoms, 3, n_atoms, 3), copy)
 
-    def get_hessian_2d(self) -> np.ndarray:
+    def get_hessian_2d(self, copy: bool = True) -> np.ndarray:
         """Get the Hessian as a 2-D array
 
         This format may be preferred for use with standard linear algebra
         functions
 
+        Args:
+            copy: If False, return a read-only view of the stored Hessian
+                rather than a copy. This avoids copying a large array.
+
         Returns:
             array with shape (n_atoms * 3, n_atoms * 3) where the elements are
             ordered by atom and Cartesian direction::
@@ -257,10 +284,20 @@ class VibrationsData:
             atoms[1] in the x-direction in response to a movement in the
             z-direction of atoms[0]
         """
-        return self._hessian2d.copy()
+        return self._hessian_array(self._hessian2d, copy)
+
+    @staticmethod
+    def _hessian_array(hessian: np.ndarray, copy: bool) -> np.ndarray:
+        if copy:
+            return hessian.copy()
+        view = hessian.view()
+        view.flags.writeable = False
+        return view
 
     def todict(self) -> Dict[str, Any]:
-        if np.allclose(self._indices, range(len(self._atoms))):
+        n_atoms = len(self._atoms)
+        if (len(self._indices) == n_atoms
+                and np.array_equal(self._indices, np.arange(n_atoms))):
             indices = None
         else:
             indices = self.get_indices()
@@ -292,34 +329,139 @@ class VibrationsData:
         see the docstring of that method for more information.
 
         """
-        active_atoms = self._atoms[self.get_mask()]
-        n_atoms = len(active_atoms)
-        masses = active_atoms.get_masses()
+        masses = self._active_masses()
+        mass_weights = np.repeat(masses**-0.5, 3)
+
+        omega2, vectors = np.linalg.eigh(
+            self._mass_weighted_hessian(mass_weights))
 
+        energies, modes = self._energies_and_modes_from_eigenpairs(
+            omega2, vectors, mass_weights)
+        self._energies = energies
+        return energies, modes
+
+    def _calculate_energies(self) -> np.ndarray:
+        """Diagonalise the Hessian for its eigenvalues only
+
+        This skips the eigenvector computation, which dominates the cost of
+        _energies_and_modes().
+        """
+        mass_weights = np.repeat(self._active_masses()**-0.5, 3)
+        omega2 = np.linalg.eigvalsh(self._mass_weighted_hessian(mass_weights))
+        return self._energies_from_eigenvalues(omega2)
+
+    def _mass_weighted_hessian(self, mass_weights: np.ndarray) -> np.ndarray:
+        """New array of the 2-D Hessian scaled by mass_weights on both sides
+
+        The Hessian is symmetrised, so that numerical noise in the input
+        does not depend on which triangle the eigensolver reads. The
+        result is scaled in place to avoid full-size temporary arrays.
+        """
+        hessian2d = self._hessian2d
+        # Keep floating types (e.g. float32) but promote integer input
+        if np.issubdtype(hessian2d.dtype, np.floating):
+            dtype = hessian2d.dtype
+        else:
+            dtype = np.dtype(float)
+        hessian = np.add(hessian2d, hessian2d.T, dtype=dtype)
+        hessian *= 0.5 * mass_weights[:, np.newaxis]
+        hessian *= mass_weights[np.newaxis, :]
+        return hessian
+
+    def _active_masses(self) -> np.ndarray:
+        """Masses of the atoms included in the Hessian"""
+        masses = self._atoms.get_masses()[self._mask]
         if not np.all(masses):
             raise ValueError('Zero mass encountered in one or more of '
                              'the vibrated atoms. Use Atoms.set_masses()'
                              ' to set all masses to non-zero values.')
+        return masses
+
+    @staticmethod
+    def _energies_and_modes_from_eigenpairs(omega2: np.ndarray,
+                                            vectors: np.ndarray,
+                                            mass_weights: np.ndarray
+                                            ) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert eigenpairs of the mass-weighted Hessian to energies/modes
+
+        Args:
+            omega2: eigenvalues, i.e. squared angular frequencies
+            vectors: corresponding eigenvectors as columns; these are
+                un-mass-weighted in place
+            mass_weights: inverse square roots of the atomic masses,
+                repeated for each Cartesian direction
+
+        """
+        vectors *= mass_weights[:, np.newaxis]
+        modes = np.ascontiguousarray(vectors.T).reshape(len(omega2), -1, 3)
+
+        return (VibrationsData._energies_from_eigenvalues(omega2), modes)
+
+    @staticmethod
+    def _energies_from_eigenvalues(omega2: np.ndarray) -> np.ndarray:
+        """Convert eigenvalues of the mass-weighted Hessian to energies in eV
+
+        Negative eigenvalues give imaginary energies.
+        """
+        # Real square roots only, to avoid a complex power over all values
+        magnitudes = _OMEGA_TO_EV * np.sqrt(np.abs(omega2))
+        is_real = omega2 >= 0
+        energies = np.zeros(len(omega2), dtype=complex)
+        energies.real[is_real] = magnitudes[is_real]
+        energies.imag[~is_real] = magnitudes[~is_real]
+        return energies
+
+    def _lowest_energies_and_modes(self, n_modes: int
+                                   ) -> Tuple[np.ndarray, np.ndarray]:
+        """Obtain only the n_modes lowest harmonic modes
+
+        The requested eigenpairs are picked out of the symmetrised,
+        mass-weighted Hessian by a dense solver which skips computing the
+        remaining eigenvectors.
+
+        """
+        if n_modes in self._partial_energies_and_modes:
+            return self._partial_energies_and_modes[n_modes]
+
+        masses = self._active_masses()
         mass_weights = np.repeat(masses**-0.5, 3)
+        n = len(mass_weights)
+
+        if not 0 < n_modes <= n:
+            raise ValueError('n_modes must be between 1 and {}'.format(n))
 
-        omega2, vectors = np.linalg.eigh(mass_weights
-                                         * self.get_hessian_2d()
-                                         * mass_weights[:, np.newaxis])
+        omega2, vectors = self._dense_lowest_eigenpairs(
+            self._mass_weighted_hessian(mass_weights), n_modes)
 
-        unit_conversion = units._hbar * units.m / sqrt(units._e * units._amu)
-        energies = unit_conversion * omega2.astype(complex)**0.5
+        result = self._energies_and_modes_from_eigenpairs(omega2, vectors,
+                                                          mass_weights)
+        self._partial_energies_and_modes[n_modes] = result
+        return result
 
-        modes = vectors.T.reshape(n_atoms * 3, n_atoms, 3)
-        modes = modes * masses[np.newaxis, :, np.newaxis]**-0.5
+    @staticmethod
+    def _dense_lowest_eigenpairs(hessian: np.ndarray, n_modes: int
+                                 ) -> Tuple[np.ndarray, np.ndarray]:
+        """Lowest eigenpairs of a symmetric matrix, which may be overwritten
+
+        Only the requested eigenvectors are computed.
+        """
+        from scipy.linalg import eigh
 
-        return (energies, modes)
+        try:
+            return eigh(hessian, subset_by_index=[0, n_modes - 1],
+                        driver='evr', overwrite_a=True)
+        except TypeError:
+            # SciPy < 1.5 has neither subset_by_index nor driver
+            return eigh(hessian, eigvals=(0, n_modes - 1), overwrite_a=True)
 
-    def get_energies_and_modes(self, all_atoms: bool = False
+    def get_energies_and_modes(self, all_atoms: bool = False,
+                               n_modes: Optional[int] = None
                                ) -> Tuple[np.ndarray, np.ndarray]:
         """Diagonalise the Hessian to obtain harmonic modes
 
-        Results are cached so diagonalization will only be performed once for
-        this object instance.
+        Results are cached so the full diagonalization will only be performed
+        once for this object instance. (If only energies were requested
+        before, the Hessian is diagonalised again to obtain the modes.)
 
         Args:
             all_atoms:
@@ -328,6 +470,14 @@ class VibrationsData:
                 attached atoms object. Atoms that were not included in the
                 Hessian will have displacement vectors of (0, 0, 0).
 
+            n_modes:
+                If given, only the n_modes lowest-energy modes are obtained,
+                by a subset eigensolver which skips the other eigenvectors.
+                This is several times cheaper than full diagonalisation for
+                large systems when only a few modes are of interest. The
+                first axis of the returned arrays then has length n_modes
+                instead of 3N.
+
         Returns:
             tuple (energies, modes)
 
@@ -339,13 +489,16 @@ class VibrationsData:
 
         """
 
-        energies, modes_from_hessian = self._energies_and_modes()
+        if n_modes is None:
+            energies, modes_from_hessian = self._energies_and_modes()
+        else:
+            energies, modes_from_hessian = self._lowest_energies_and_modes(
+                n_modes)
 
         if all_atoms:
-            n_active_atoms = len(self.get_indices())
             n_all_atoms = len(self._atoms)
-            modes = np.zeros((3 * n_active_atoms, n_all_atoms, 3))
-            modes[:, self.get_mask(), :] = modes_from_hessian
+            modes = np.zeros((len(energies), n_all_atoms, 3))
+            modes[:, self._mask, :] = modes_from_hessian
         else:
             modes = modes_from_hessian.copy()
 
@@ -354,8 +507,9 @@ class VibrationsData:
     def get_modes(self, all_atoms: bool = False) -> np.ndarray:
         """Diagonalise the Hessian to obtain harmonic modes
 
-        Results are cached so diagonalization will only be performed once for
-        this object instance.
+        Results are cached so the full diagonalization will only be performed
+        once for this object instance. (If only energies were requested
+        before, the Hessian is diagonalised again to obtain the modes.)
 
         all_atoms:
             If True, return modes as (3N, [N + N_frozen], 3) array where
@@ -373,20 +527,23 @@ class VibrationsData:
     def get_energies(self) -> np.ndarray:
         """Diagonalise the Hessian to obtain eigenvalues
 
-        Results are cached so diagonalization will only be performed once for
-        this object instance.
+        Results are cached. If the modes have not been calculated yet, only
+        the eigenvalues are computed; a later call to get_modes() or
+        get_energies_and_modes() then diagonalises the Hessian again.
 
         Returns:
             Harmonic mode energies in units of eV
 
         """
-        return self.get_energies_and_modes()[0]
+        # This is already set if the modes have been calculated
+        if self._energies is None:
+            self._energies = self._calculate_energies()
+        return self._energies.copy()
 
     def get_frequencies(self) -> np.ndarray:
         """Diagonalise the Hessian to obtain frequencies in cm^-1
 
-        Results are cached so diagonalization will only be performed once for
-        this object instance.
+        Results are cached, as for get_energies().
 
         Returns:
             Harmonic mode frequencies in units of cm^-1
@@ -440,17 +597,17 @@ class VibrationsData:
                          '  #    meV     cm^-1',
                          '---------------------']
 
-        for n, e in enumerate(energies):
-            if abs(e.imag) > im_tol:
-                c = 'i'
-                e = e.imag
-            else:
-                c = ''
-                e = e.real
-
-            summary_lines.append('{index:3d} {mev:6.1f}{im:1s}  {cm:7.1f}{im}'
-                                 .format(index=n, mev=(e * 1e3),
-                                         cm=(e / units.invcm), im=c))
+        energies = np.asarray(energies)
+        is_imaginary = np.abs(energies.imag) > im_tol
+        values = np.where(is_imaginary, energies.imag, energies.real)
+        marks = np.where(is_imaginary, 'i', '')
+
+        summary_lines += ['{index:3d} {mev:6.1f}{im:1s}  {cm:7.1f}{im}'
+                          .format(index=n, mev=mev, cm=cm, im=im)
+                          for n, (mev, cm, im)
+                          in enumerate(zip((values * 1e3).tolist(),
+                                           (values / units.invcm).tolist(),
+                                           marks.tolist()))]
         summary_lines.append('---------------------')
         summary_lines.append('Zero-point energy: {:.3f} eV'.format(
             cls._calculate_zero_point_energy(energies=energies)))
@@ -472,12 +629,18 @@ class VibrationsData:
 
         """
 
-        mode = (self.get_modes(all_atoms=True)[mode_index]
-                * sqrt(temperature / abs(self.get_energies()[mode_index])))
+        # Use the cached arrays directly rather than copying all modes
+        energies, modes = self._energies_and_modes()
+        mode = modes[mode_index] * sqrt(temperature
+                                        / abs(energies[mode_index]))
+
+        # Displacements of the active atoms for all frames at once
+        phases = np.linspace(0, 2 * pi, frames, endpoint=False)
+        displacements = np.sin(phases)[:, np.newaxis, np.newaxis] * mode
 
-        for phase in np.linspace(0, 2 * pi, frames, endpoint=False):
+        for displacement in displacements:
             atoms = self.get_atoms()
-            atoms.positions += sin(phase) * mode
+            atoms.positions[self._mask] += displacement
 
             yield atoms
 
@@ -524,10 +687,11 @@ class VibrationsData:
                 be convenient when comparing to experimental data.
         """
 
-        all_images = list(self._get_jmol_images(atoms=self.get_atoms(),
-                                                energies=self.get_energies(),
-                                                modes=self.get_modes(
-                                                    all_atoms=True),
+        # No need for a copy of atoms here: _get_jmol_images makes its own
+        energies, modes = self.get_energies_and_modes(all_atoms=True)
+        all_images = list(self._get_jmol_images(atoms=self._atoms,
+                                                energies=energies,
+                                                modes=modes,
                                                 ir_intensities=ir_intensities))
         ase.io.write(filename, all_images, format='extxyz')
 
@@ -564,24 +728,25 @@ class VibrationsData:
             Iterator of Atoms objects
 
         """
-        for i, (energy, mode) in enumerate(zip(energies, modes)):
-            # write imaginary frequencies as negative numbers
-            if energy.imag > energy.real:
-                energy = float(-energy.imag)
-            else:
-                energy = energy.real
-
-            image = atoms.copy()
+        # Custom masses are quite useful in vibration analysis, but will
+        # show up in the xyz file unless we remove them
+        template = atoms.copy()
+        if template.has('masses'):
+            del template.arrays['masses']
+
+        # write imaginary frequencies as negative numbers
+        energies = np.asarray(energies)
+        frequencies = np.where(energies.imag > energies.real,
+                               -energies.imag, energies.real) / units.invcm
+
+        for i, (frequency, mode) in enumerate(zip(frequencies.tolist(),
+                                                  modes)):
+            image = template.copy()
             image.info.update({'mode#': str(i),
-                               'frequency_cm-1': energy / units.invcm,
+                               'frequency_cm-1': frequency,
                                })
             image.arrays['mode'] = mode
 
-            # Custom masses are quite useful in vibration analysis, but will
-            # show up in the xyz file unless we remove them
-            if image.has('masses'):
-                del image.arrays['masses']
-
             if ir_intensities is not None:
                 image.info['IR_intensity'] = float(ir_intensities[i])
 
@@ -594,16 +759,16 @@ class VibrationsData:
 
     def get_pdos(self) -> DOSCollection:
         """Phonon DOS, including atomic contributions"""
-        energies = self.get_energies()
-        masses = self._atoms[self.get_mask()].get_masses()
+        energies, modes = self.get_energies_and_modes()
+        masses = self._atoms.get_masses()[self._mask]
 
-        # Get weights as N_moving_atoms x N_modes array
-        vectors = self.get_modes() / masses[np.newaxis, :, np.newaxis]**-0.5
-        all_weights = (np.linalg.norm(vectors, axis=-1)**2).T
+        # Get weights as N_moving_atoms x N_modes array: the squared norms of
+        # the mass-weighted (i.e. normalised) eigenvectors
+        all_weights = np.einsum('mad,mad,a->am', modes, modes, masses)
 
-        mask = self.get_mask()
-        all_info = [{'index': i, 'symbol': a.symbol}
-                    for i, a in enumerate(self._atoms) if mask[i]]
+        symbols = self._atoms.get_chemical_symbols()
+        all_info = [{'index': i, 'symbol': symbols[i]}
+                    for i in np.flatnonzero(self._mask).tolist()]
 
         return DOSCollection([RawDOSData(energies, weights, info=info)
                               for weights, info in zip(all_weights, all_info)])
@@ -622,5 +787,5 @@ class VibrationsData:
 
         new_atoms = self.get_atoms()
         new_atoms.set_masses(masses)
-        return self.__class__(new_atoms, self.get_hessian(),
-                              indices=self.get_indices())
+        return self.__class__(new_atoms, self.get_hessian(copy=False),
+                              indices=self._indices)